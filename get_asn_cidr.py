@@ -1,240 +1,399 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from io import StringIO
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Pool
+import bisect
 import os
+import pickle
 import requests
 import ipaddress
 import csv
 import json
+import mmap
 import re
-import subprocess
+import socket
+import struct
 import sys
 
+# per-prefix constants, looked up instead of recomputed for every CIDR block
+BLOCK_SIZES = tuple(1 << host_bits for host_bits in range(129))
+PREFIXLEN_SUFFIXES = tuple(f"/{prefixlen}" for prefixlen in range(129))
+
 def ip_to_int_v4(ip):
-    import struct
-    import socket
     return struct.unpack("!I", socket.inet_aton(ip))[0]
 
 def int_to_ip_v4(ip_int):
-    import struct
-    import socket
     return socket.inet_ntoa(struct.pack("!I", ip_int))
 
-def ip_range_to_cidr_v4(start_ip, end_ip):
-    start_int = ip_to_int_v4(start_ip)
-    end_int = ip_to_int_v4(end_ip)
+def range_to_cidrs(start_int, end_int, max_prefixlen):
+    """
+    Split an inclusive integer address range into the fewest aligned CIDR blocks.
 
-    cidr_list = []
+    Each block is the largest one that is aligned on start_int and does not pass end_int,
+    so a range takes at most 2 * max_prefixlen steps.
 
+    :param start_int: int, first address of the range
+    :param end_int: int, last address of the range
+    :param max_prefixlen: int, address width, 32 for IPv4 or 128 for IPv6
+    :return: generator of (network address int, prefixlen) tuples
+    """
+    size = end_int - start_int + 1
+    if size > 0 and size & (size - 1) == 0 and start_int & (size - 1) == 0:
+        # most CSV ranges are already a single aligned block
+        yield start_int, max_prefixlen - size.bit_length() + 1
+        return
     while start_int <= end_int:
-        max_size = 32
-        while max_size > 0:
-            mask = 0xFFFFFFFF << (32 - max_size) & 0xFFFFFFFF
-            if (start_int & mask) != start_int:
-                break
-            broadcast = start_int + (1 << (32 - max_size)) - 1
-            if broadcast > end_int:
-                break
-            max_size -= 1
-        max_size += 1
-        cidr_list.append(f"{int_to_ip_v4(start_int)}/{max_size}")
-        start_int += (1 << (32 - max_size))
-
-    return "\n".join(cidr_list)
+        align_bits = (start_int & -start_int).bit_length() - 1 if start_int else max_prefixlen
+        host_bits = min(align_bits, (end_int - start_int + 1).bit_length() - 1)
+        yield start_int, max_prefixlen - host_bits
+        start_int += BLOCK_SIZES[host_bits]
 
-def ip_to_int_v6(ip):
-    import ipaddress
-    return int(ipaddress.IPv6Address(ip))
+def merge_adjacent_ranges(ip_ranges):
+    """
+    Merge consecutive IP ranges that overlap or touch, so they decompose into the fewest CIDRs.
 
-def int_to_ip_v6(ip_int):
-    import ipaddress
-    return str(ipaddress.IPv6Address(ip_int))
+    This is the batch step ipaddress.collapse_addresses performs on networks, done on the
+    int ranges before they are split into CIDR blocks.
 
-def ip_range_to_cidr_v6(start_ip, end_ip):
-    start_int = ip_to_int_v6(start_ip)
-    end_int = ip_to_int_v6(end_ip)
+    :param ip_ranges: iterable of (start, end) int tuples, in ascending order
+    :return: generator of merged (start, end) int tuples
+    """
+    merged_start = merged_end = None
+    for start_int, end_int in ip_ranges:
+        if merged_end is not None and merged_start <= start_int <= merged_end + 1:
+            merged_end = max(merged_end, end_int)
+            continue
+        if merged_end is not None:
+            yield merged_start, merged_end
+        merged_start, merged_end = start_int, end_int
+    if merged_end is not None:
+        yield merged_start, merged_end
+
+def ip_range_to_cidr_v4(start_int, end_int):
+    for network, prefixlen in range_to_cidrs(start_int, end_int, 32):
+        yield int_to_ip_v4(network) + PREFIXLEN_SUFFIXES[prefixlen]
 
-    cidr_list = []
+def ip_to_int_v6(ip):
+    return int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), "big")
 
-    while start_int <= end_int:
-        max_size = 128
-        while max_size > 0:
-            mask = (0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF << (128 - max_size)) & 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
-            if (start_int & mask) != start_int:
-                break
-            broadcast = start_int + (1 << (128 - max_size)) - 1
-            if broadcast > end_int:
-                break
-            max_size -= 1
-        max_size += 1
-        cidr_list.append(f"{int_to_ip_v6(start_int)}/{max_size}")
-        start_int += (1 << (128 - max_size))
-
-    return "\n".join(cidr_list)
-
-def fetch_cidr_list_from_url(url):
+def int_to_ip_v6(ip_int):
+    hex_str = '%032x' % ip_int
+    hextets = [hex_str[i:i + 4].lstrip('0') or '0' for i in range(0, 32, 4)]
+    # replace the first longest run of two or more zero hextets with "::", as ipaddress does
+    best_start, best_len, run_start = -1, 1, -1
+    for index, hextet in enumerate(hextets + ['']):
+        if hextet == '0':
+            if run_start < 0:
+                run_start = index
+        elif run_start >= 0:
+            if index - run_start > best_len:
+                best_start, best_len = run_start, index - run_start
+            run_start = -1
+    if best_start < 0:
+        return ':'.join(hextets)
+    return ':'.join(hextets[:best_start]) + '::' + ':'.join(hextets[best_start + best_len:])
+
+def ip_range_to_cidr_v6(start_int, end_int):
+    for network, prefixlen in range_to_cidrs(start_int, end_int, 128):
+        yield int_to_ip_v6(network) + PREFIXLEN_SUFFIXES[prefixlen]
+
+def fetch_cidr_list_from_url(url, session=requests):
     """
     Fetch a list of CIDR ranges from a given URL.
 
     :param url: str, URL to fetch the CIDR list from
+    :param session: requests.Session to reuse connections from, defaults to a one-off request
     :return: list of str, CIDR ranges
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        cidr_list = response.text.splitlines()
-        return [cidr.strip() for cidr in cidr_list if cidr.strip()]
+        with session.get(url, stream=True) as response:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = "utf-8"
+            cidr_list = response.iter_lines(decode_unicode=True)
+            return [cidr.strip() for cidr in cidr_list if cidr.strip()]
     except requests.RequestException as e:
         print(f"Error fetching CIDR list from URL: {e}")
         return []
 
-def is_cidr_in_cidr_list(input_cidr, cidr_list):
+def build_cidr_lookup(cidr_list):
     """
-    Check if the given IP address is in any of the given CIDR ranges.
+    Turn the given CIDR ranges into sorted, non-overlapping integer ranges per IP version.
+
+    Nested and back-to-back CIDR ranges are coalesced, so an IP range spanning several
+    adjacent CIDR ranges from the list counts as covered and the lookup stays small.
 
-    :param ip: str, IP address (IPv4 or IPv6) to check
-    :param cidr_list: list of str, CIDR ranges to check against
-    :return: bool, True if IP is in any CIDR range, False otherwise
+    :param cidr_list: list of str, CIDR ranges to index
+    :return: dict, ip_version -> (starts, ends), parallel sequences of range bounds sorted by start
     """
+    cidr_ranges = {4: [], 6: []}
     for cidr in cidr_list:
-        if is_cidr_in_cidr(input_cidr, cidr):
-            return True
-    return False
+        try:
+            cidr_obj = ipaddress.ip_network(cidr, strict=False)
+        except ValueError:
+            continue
+        cidr_ranges[cidr_obj.version].append((int(cidr_obj.network_address), int(cidr_obj.broadcast_address)))
+
+    cidr_lookup = {}
+    for version, ranges in cidr_ranges.items():
+        merged = list(merge_adjacent_ranges(sorted(ranges)))
+        # IPv4 bounds fit a machine word and pack into a typed array, IPv6 bounds stay Python ints
+        column = partial(array, 'L') if version == 4 else list
+        cidr_lookup[version] = (column(start for start, _ in merged), column(end for _, end in merged))
+    return cidr_lookup
+
+def filter_ranges_not_in_cidr_list(ip_ranges, ip_version, cidr_lookup):
+    """
+    Drop the IP ranges that are fully covered by the indexed CIDR ranges.
 
-def is_cidr_in_cidr(cidr1, cidr2):
+    The CSV lists ranges by ascending start address, so the candidate CIDR range is usually
+    the one already under the cursor; the cursor only falls back to binary search when a
+    range starts past the next CIDR range or before the current one.
+
+    :param ip_ranges: iterable of (start, end) int tuples
+    :param ip_version: int, 4 or 6
+    :param cidr_lookup: dict, CIDR ranges indexed by build_cidr_lookup
+    :return: generator of (start, end) int tuples not covered by the CIDR ranges
     """
-    Check if the given CIDR range cidr1 is within the given CIDR range cidr2, or if they are equal.
+    starts, ends = cidr_lookup[ip_version]
+    cursor = 0
+    for start_int, end_int in ip_ranges:
+        # cursor is the index of the first CIDR range starting after start_int
+        if (cursor < len(starts) and starts[cursor] <= start_int) \
+        or (cursor > 0 and starts[cursor - 1] > start_int):
+            cursor = bisect.bisect_right(starts, start_int)
+        if cursor > 0 and ends[cursor - 1] >= end_int:
+            continue
+        yield start_int, end_int
 
-    :param cidr1: str, CIDR range to check if it's within or equal to cidr2
-    :param cidr2: str, CIDR range to check against
-    :return: bool, True if cidr1 is within or equal to cidr2, False otherwise
+    
+ASN_CSV_PATH = "asn.csv"
+COUNTRY_ASN_CSV_PATH = "country_asn.csv"
+
+# a single CSV field, either quoted (may contain commas) or plain
+CSV_FIELD_PATTERN = rb'(?:"(?:[^"]|"")*"|[^,"\r\n]*)'
+
+# file_path -> asn -> line spans, filled by index_asn_lines for the arg list file
+asn_line_index = {}
+
+def index_asn_lines(file_path, target_asns):
     """
-    try:
-        cidr1_obj = ipaddress.ip_network(cidr1, strict=False)
-        cidr2_obj = ipaddress.ip_network(cidr2, strict=False)
-        return cidr1_obj.subnet_of(cidr2_obj) or cidr1_obj == cidr2_obj
-    except ValueError:
-        return False
+    Scan the CSV once and record where the lines of every one of the given ASNs are.
 
-def check_ip_version(ip):
+    A single compiled regex reads the asn column of every line, so an arg list with many
+    ASNs costs one pass over the file instead of one pass per entry.
+
+    :param file_path: str, path of the CSV file
+    :param target_asns: iterable of str, ASNs to index
+    :return: dict, asn -> list of (line_start, line_end) byte offsets
+    """
+    line_index = {asn: [] for asn in target_asns}
+    asns_pattern = b'|'.join(re.escape(asn.encode('utf-8')) for asn in line_index)
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b'\n') + 1 or len(mm)
+        asn_column = mm[:header_end].decode('utf-8').strip().split(',').index('asn')
+        pattern = re.compile(rb'(?m)^(?:%s,){%d}(%s)(?=,|\r?$)' % (CSV_FIELD_PATTERN, asn_column, asns_pattern))
+        for match in pattern.finditer(mm, header_end):
+            line_end = mm.find(b'\n', match.end())
+            if line_end == -1:
+                line_end = len(mm)
+            line_index[match.group(1).decode('utf-8')].append((match.start(), line_end))
+    return line_index
+
+def load_asn_line_index(file_path, target_asns):
+    """
+    Return the line index of the given ASNs, reusing the one cached next to the CSV while the CSV is unchanged.
+
+    :param file_path: str, path of the CSV file
+    :param target_asns: set of str, ASNs that must be in the index
+    :return: dict, asn -> list of (line_start, line_end) byte offsets
+    """
+    cache_path = f"{file_path}.index"
+    csv_stat = os.stat(file_path)
+    csv_version = (csv_stat.st_size, csv_stat.st_mtime_ns)
     try:
-        ip_obj = ipaddress.ip_address(ip)
-        if isinstance(ip_obj, ipaddress.IPv4Address):
-            return 4
-        elif isinstance(ip_obj, ipaddress.IPv6Address):
-            return 6
-    except ValueError:
-        return "Invalid IP address"
+        with open(cache_path, 'rb') as file:
+            cached_version, line_index = pickle.load(file)
+        if cached_version == csv_version and target_asns <= line_index.keys():
+            return line_index
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    line_index = index_asn_lines(file_path, target_asns)
+    try:
+        with open(cache_path, 'wb') as file:
+            pickle.dump((csv_version, line_index), file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print(f"Error saving line index cache: {e}")
+    return line_index
 
-    
 def find_asn_lines(file_path, target_asn):
-    pattern = re.compile(rf'^{target_asn},|,{target_asn},|,{target_asn}$')
-    
-    with open(file_path, 'r', buffering=1) as file:
-        header = file.readline().strip()
+    """
+    Yield the CSV header, then every line whose asn column equals target_asn ("ALL" matches every line).
+
+    The file is memory-mapped and searched for the ASN literal; each hit is accepted only
+    if the ASN sits in the asn column, so names that mention the ASN are skipped.
+
+    :param file_path: str, path of the CSV file
+    :param target_asn: str, ASN to look for, e.g. AS13335
+    :return: generator of str, lines without line endings
+    """
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        header_end = mm.find(b'\n') + 1 or len(mm)
+        header = mm[:header_end].decode('utf-8').strip()
         yield header
-    try:
-        result = subprocess.run(['grep', target_asn, file_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
-        lines = result.stdout.splitlines()
-        for line in lines:
-            yield line
-    except subprocess.CalledProcessError as e:
-        print(f"Error occurred: {e.stderr}")
+
+        line_spans = asn_line_index.get(file_path, {}).get(str(target_asn))
+        if line_spans is not None:
+            for line_start, line_end in line_spans:
+                yield mm[line_start:line_end].decode('utf-8').rstrip('\r')
+            return
+
+        if str(target_asn) == "ALL":
+            mm.seek(header_end)
+            for line in iter(mm.readline, b''):
+                yield line.decode('utf-8').rstrip('\r\n')
+            return
+
+        asn_column = header.split(',').index('asn')
+        asn_bytes = str(target_asn).encode('utf-8')
+        pattern = re.compile(rb'(?:%s,){%d}%s(?=,|\r?$)' % (CSV_FIELD_PATTERN, asn_column, re.escape(asn_bytes)))
+        position = mm.find(asn_bytes, header_end)
+        while position != -1:
+            line_start = mm.rfind(b'\n', 0, position) + 1
+            line_end = mm.find(b'\n', position)
+            if line_end == -1:
+                line_end = len(mm)
+            if pattern.match(mm, line_start, line_end):
+                yield mm[line_start:line_end].decode('utf-8').rstrip('\r')
+            position = mm.find(asn_bytes, line_end)
 
 # calc and output ipcidr
-def save_ipcidr(start_ip, end_ip, ip_version, file, exclude_v4_cidrs, exclude_v6_cidrs):
-    start_ip_version = check_ip_version(start_ip)
-    if int(start_ip_version) == 4 and int(ip_version) == int(start_ip_version) :
-        cidr = ip_range_to_cidr_v4(start_ip, end_ip)
-        if exclude_v4_cidrs is None or not is_cidr_in_cidr_list(cidr, exclude_v4_cidrs) :
-            # if cidr not in exculde_cidr_list, save it to files
-            file.write(''.join(cidr) + '\n')
-    elif int(start_ip_version) == 6 and int(ip_version) == int(start_ip_version) :
-        cidr = ip_range_to_cidr_v6(start_ip, end_ip)
-        if exclude_v6_cidrs is None or not is_cidr_in_cidr_list(cidr, exclude_v6_cidrs) :
-            # if cidr not in exculde_cidr_list, save it to files
-            file.write(''.join(cidr) + '\n')
+def save_ipcidr(ip_ranges, ip_version, file, exclude_v4_cidrs, exclude_v6_cidrs):
+    ip_version = int(ip_version)
+    if ip_version == 4:
+        ip_to_int, ip_range_to_cidr, exclude_cidrs = ip_to_int_v4, ip_range_to_cidr_v4, exclude_v4_cidrs
+    else:
+        ip_to_int, ip_range_to_cidr, exclude_cidrs = ip_to_int_v6, ip_range_to_cidr_v6, exclude_v6_cidrs
+
+    int_ranges = ((ip_to_int(start_ip), ip_to_int(end_ip)) for start_ip, end_ip in ip_ranges)
+    if exclude_cidrs is not None:
+        # if ip range in exculde_cidr_list, do not save it to files
+        int_ranges = filter_ranges_not_in_cidr_list(int_ranges, ip_version, exclude_cidrs)
+    cidrs = [cidr for start_int, end_int in merge_adjacent_ranges(int_ranges)
+             for cidr in ip_range_to_cidr(start_int, end_int)]
+    # encode the whole output once and hand it to a single write call
+    file.write(''.join(cidr + '\n' for cidr in cidrs).encode('utf-8'))
 
 # start_ip,end_ip,asn,name,domain
 def get_asn_ipcidr(file_path, asn, ip_version):
-    matching_lines = find_asn_lines(file_path, asn)
-    header = next(matching_lines)
-    csv_reader = csv.DictReader(StringIO('\n'.join([header] + list(matching_lines))))
+    csv_reader = csv.reader(find_asn_lines(file_path, asn))
+    header = next(csv_reader)
+    start_ip_column, end_ip_column = header.index('start_ip'), header.index('end_ip')
+    is_ipv6 = int(ip_version) == 6
     directory = f"output/{asn}"
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    with open(f"{directory}/IPV{ip_version}.cidr", 'w') as file:
-        for row in csv_reader:
-            if row['asn'] == str(asn) or str(asn) == "ALL" :
-                save_ipcidr(row['start_ip'], row['end_ip'], ip_version, file, None, None)
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{directory}/IPV{ip_version}.cidr", 'wb') as file:
+        # addresses in the ipinfo CSVs are well-formed, so a colon alone marks IPv6
+        ip_ranges = ((row[start_ip_column], row[end_ip_column]) for row in csv_reader
+                     if (':' in row[start_ip_column]) == is_ipv6)
+        save_ipcidr(ip_ranges, ip_version, file, None, None)
      
 
 # start_ip,end_ip,country,country_name,continent,continent_name,asn,as_name,as_domain
 def get_asn_ipcidr_for_specific_area(file_path, asn, continent, country, ip_version, exclude_v4_cidrs, exclude_v6_cidrs, exclude_country):
-    if str(country) != "ALL":
-        # if country is not ALL, do not use exclude_country.
-        exclude_country == ""
-
-    matching_lines = find_asn_lines(file_path, asn)
-    header = next(matching_lines)
-    csv_reader = csv.DictReader(StringIO('\n'.join([header] + list(matching_lines))))
+    csv_reader = csv.reader(find_asn_lines(file_path, asn))
+    header = next(csv_reader)
+    start_ip_column, end_ip_column = header.index('start_ip'), header.index('end_ip')
+    continent_column, country_column = header.index('continent'), header.index('country')
+    is_ipv6 = int(ip_version) == 6
+    # the row filter runs for every matching line, so settle the loop-invariant parts here
+    continent, country = str(continent), str(country)
+    all_continents, all_countries = continent == "ALL", country == "ALL"
+    # if country is not ALL, do not use exclude_country.
+    exclude_country = str(exclude_country) if all_countries else None
     directory = f"output/{asn}"
-    if not os.path.exists(directory):
-        os.makedirs(directory)
-    with open(f"{directory}/{continent}_{country}_IPV{ip_version}.cidr", 'w') as file:
-        for row in csv_reader:
-            if  ( row['asn'] == str(asn) or str(asn) == "ALL" ) \
-            and ( row['continent'] == str(continent) or str(continent) == "ALL" ) \
-            and ( row['country'] == str(country) or str(country) == "ALL" ) \
-            and ( row['country'] != str(exclude_country) ):
-                save_ipcidr(row['start_ip'], row['end_ip'], ip_version, file, exclude_v4_cidrs, exclude_v6_cidrs)
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{directory}/{continent}_{country}_IPV{ip_version}.cidr", 'wb') as file:
+        # addresses in the ipinfo CSVs are well-formed, so a colon alone marks IPv6
+        ip_ranges = ((row[start_ip_column], row[end_ip_column]) for row in csv_reader
+                     if  ( (':' in row[start_ip_column]) == is_ipv6 ) \
+                     and ( all_continents or row[continent_column] == continent ) \
+                     and ( all_countries or row[country_column] == country ) \
+                     and ( row[country_column] != exclude_country ))
+        save_ipcidr(ip_ranges, ip_version, file, exclude_v4_cidrs, exclude_v6_cidrs)
 
 def func_asn_ipcidr(target_asn, ip_version) :
-    file_path = "asn.csv"
+    file_path = ASN_CSV_PATH
     if int(ip_version) != 4 and int(ip_version) != 6:
         print(f"Error: ip_version must be 4 or 6, but you give {ip_version}")
     else:
         get_asn_ipcidr(file_path, target_asn, ip_version)
 
 def func_asn_ipcidr_for_specific_area(target_asn, continent, country, ip_version, exclude_v4_cidrs, exclude_v6_cidrs, exclude_country) :
-    file_path = "country_asn.csv"
+    file_path = COUNTRY_ASN_CSV_PATH
     if int(ip_version) != 4 and int(ip_version) != 6:
         print(f"Error: ip_version must be 4 or 6, but you give {ip_version}")
     else:
         get_asn_ipcidr_for_specific_area(file_path, target_asn, continent, country, ip_version, exclude_v4_cidrs, exclude_v6_cidrs, exclude_country)
 
 
-if len(sys.argv) != 2 and len(sys.argv) != 3 and len(sys.argv) != 5:
-    print(f"Usage: python3 {sys.argv[0]} <arg_list_file>")
-    print(f"Usage: python3 {sys.argv[0]} <asn> <ip_version 4 or 6>")
-    print(f"Usage: python3 {sys.argv[0]} <asn> <continent> <country> <ip_version 4 or 6>")
-    sys.exit(1)
-
-anycatch_v4_prefixes_url = "https://raw.githubusercontent.com/bgptools/anycast-prefixes/master/anycatch-v4-prefixes.txt"
-anycatch_v6_prefixes_url = "https://raw.githubusercontent.com/bgptools/anycast-prefixes/master/anycatch-v6-prefixes.txt"
-anycast_v4_cidr_list = fetch_cidr_list_from_url(anycatch_v4_prefixes_url)
-anycast_v6_cidr_list = fetch_cidr_list_from_url(anycatch_v6_prefixes_url)
-exclude_country = "CN"
-
-if len(sys.argv) == 2 :
-   with open(sys.argv[1], 'r') as file:
-        lines = file.readlines()
-        for line in lines:
-            stripped_line = line.strip()
-            if not stripped_line or stripped_line.startswith('#'):
-                continue
-            # split line into argv
-            argv = stripped_line.split()
-            if len(argv) == 2:
-                func_asn_ipcidr(argv[0], argv[1])
-            elif len(argv) == 4:
-                func_asn_ipcidr_for_specific_area(argv[0], argv[1], argv[2], argv[3], anycast_v4_cidr_list, anycast_v6_cidr_list, exclude_country)
-
-        
-
-if len(sys.argv) == 3 :
-    func_asn_ipcidr(sys.argv[1], sys.argv[2])
-
-if len(sys.argv) == 5 :
-    func_asn_ipcidr_for_specific_area(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], anycast_v4_cidr_list, anycast_v6_cidr_list, exclude_country)
+def init_arg_list_worker(exclude_v4_cidrs, exclude_v6_cidrs, exclude_country, line_index):
+    # hand the anycast lookups and line index to each worker once instead of with every entry
+    global worker_exclude_args
+    worker_exclude_args = (exclude_v4_cidrs, exclude_v6_cidrs, exclude_country)
+    asn_line_index.update(line_index)
+
+def run_arg_list_entry(argv):
+    if len(argv) == 2:
+        func_asn_ipcidr(argv[0], argv[1])
+    elif len(argv) == 4:
+        func_asn_ipcidr_for_specific_area(argv[0], argv[1], argv[2], argv[3], *worker_exclude_args)
+
+def main():
+    if len(sys.argv) != 2 and len(sys.argv) != 3 and len(sys.argv) != 5:
+        print(f"Usage: python3 {sys.argv[0]} <arg_list_file>")
+        print(f"Usage: python3 {sys.argv[0]} <asn> <ip_version 4 or 6>")
+        print(f"Usage: python3 {sys.argv[0]} <asn> <continent> <country> <ip_version 4 or 6>")
+        sys.exit(1)
+
+    anycatch_v4_prefixes_url = "https://raw.githubusercontent.com/bgptools/anycast-prefixes/master/anycatch-v4-prefixes.txt"
+    anycatch_v6_prefixes_url = "https://raw.githubusercontent.com/bgptools/anycast-prefixes/master/anycatch-v6-prefixes.txt"
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=2) as executor:
+        anycast_v4_cidr_list, anycast_v6_cidr_list = map(build_cidr_lookup, executor.map(
+            partial(fetch_cidr_list_from_url, session=session), [anycatch_v4_prefixes_url, anycatch_v6_prefixes_url]))
+    exclude_country = "CN"
+
+    if len(sys.argv) == 2 :
+        entries = []
+        with open(sys.argv[1], 'r') as file:
+            lines = file.readlines()
+            for line in lines:
+                stripped_line = line.strip()
+                if not stripped_line or stripped_line.startswith('#'):
+                    continue
+                # split line into argv
+                argv = tuple(stripped_line.split())
+                if len(argv) == 2 or len(argv) == 4:
+                    entries.append(argv)
+        # every entry writes its own output file, a repeated entry would only rewrite it
+        entries = list(dict.fromkeys(entries))
+        for file_path, argc in ((ASN_CSV_PATH, 2), (COUNTRY_ASN_CSV_PATH, 4)):
+            target_asns = {argv[0] for argv in entries if len(argv) == argc and argv[0] != "ALL"}
+            if target_asns:
+                asn_line_index[file_path] = load_asn_line_index(file_path, target_asns)
+        with Pool(initializer=init_arg_list_worker, initargs=(anycast_v4_cidr_list, anycast_v6_cidr_list, exclude_country, asn_line_index)) as pool:
+            for _ in pool.imap_unordered(run_arg_list_entry, entries):
+                pass
+
+    if len(sys.argv) == 3 :
+        func_asn_ipcidr(sys.argv[1], sys.argv[2])
+
+    if len(sys.argv) == 5 :
+        func_asn_ipcidr_for_specific_area(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], anycast_v4_cidr_list, anycast_v6_cidr_list, exclude_country)
+
+if __name__ == "__main__":
+    main()